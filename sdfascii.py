@@ -17,11 +17,16 @@ Signal Analyzers.
 from __future__ import annotations
 
 # Standard module imports
+import concurrent.futures
 from datetime import datetime
+import functools
 import json
+import math
+import mmap
+import os
 import struct
 import sys
-from typing import Any, Dict, TypedDict, Union, cast
+from typing import Any, Dict, Iterable, Iterator, TypedDict, Union, cast
 
 # Data analysis related imports
 import numpy as np
@@ -42,12 +47,240 @@ SCAN_BIG_RECORD_TYPE = 18
 SCAN_VAR_RECORD_TYPE = 19
 COMMENT_HDR_RECORD_TYPE = 20
 
+# Files at least this large are memory mapped rather than read into memory.
+_MMAP_MIN_FILE_SIZE = 10 * 1024 * 1024
+
+# Pre-compiled binary layouts for the fixed portions of each record type.
+# > = big-endian, so no alignment padding is inserted between fields.
+# Every record starts with the record type (short) and record size (long).
+_RECORD_HDR_STRUCT = struct.Struct('>hl')
+# The file header fields start at byte 6, immediately after the record type
+# (short) and record size (long).
+_FILE_HDR_STRUCT = struct.Struct('>2h3h8s6h7l')
+# Bytes 10-18 of the measurement header aren't decoded. Bytes 24-28 hold the
+# start and stop frequency indices for SDF revision 2.
+_MEAS_HDR_STRUCT = struct.Struct('>l8xl4hlf60sf3d3hd')
+# The x and y unit sub-records (bytes 68-90 and 92-114) are skipped with pad
+# bytes and decoded separately by _decode_sdf_unit. Bytes 30-34 hold the
+# number of points and the last valid index for SDF revision 2.
+_DATA_HDR_STRUCT = struct.Struct('>l16s2h2h8x9hl2h22xh22x')
+_DATA_HDR_V1_STRUCT = struct.Struct('>2f')
+_DATA_HDR_V2_STRUCT = struct.Struct('>2d2h')
+# The channel header layout covers the entire record, including the record
+# type and size, so a block of records can be decoded with iter_unpack. The
+# window (bytes 64-88) and engineering unit (bytes 116-138) sub-records are
+# skipped with pad bytes and decoded separately.
+_CHANNEL_HDR_STRUCT = struct.Struct('>hll30s12s12s24xh2f4h10s22x2f3h5d')
+
+# Vector header records only contain fixed-size numeric fields, so a block of
+# them is decoded at once as a numpy structured array.
+_VECTOR_HDR_FIELDS: dict = {
+    'names': ['record_type', 'record_size', 'offset_unique_record',
+              'channel_record', 'channel_power_48x'],
+    'formats': ['>i2', '>i4', '>i4', ('>i2', 2), ('>i2', 2)],
+    'offsets': [0, 2, 6, 10, 14],
+}
+# The scan structure fields ahead of its scan unit sub-record, from byte 6.
+_SCAN_STRUCT_STRUCT = struct.Struct('>4h')
+_UNIT_STRUCT = struct.Struct('>10sf8b')
+_WINDOW_STRUCT = struct.Struct('>2h5f')
+
+# Lookup tables mapping the coded values stored in the SDF records to their
+# human readable descriptions. Codes that run densely from zero or one are
+# looked up in tuples with _decode_dense_code, which bounds checks the index;
+# the rest are looked up in dicts.
+_WINDOW_TYPE_DECODER = ('Window not applied',
+                        'Hanning',
+                        'Flat Top',
+                        'Uniform',
+                        'Force',
+                        'Response',
+                        'user-defined',
+                        'Hamming',
+                        'P301',
+                        'P310',
+                        'Kaiser-Bessel',
+                        'Harris',
+                        'Blackman',
+                        'Resolution filter',
+                        'Correlation Lead Lag',
+                        'Correlation Lag',
+                        'Gated',
+                        'P400',
+                        )
+
+_CORRECTION_MODE_DECODER = ('Correction not applied',
+                            'Narrow band correction applied',
+                            'Wide band correction applied')
+
+_APPLICATION_DECODER = {-1: 'HP VISTA', -2: 'HP SINE', -3: 'HP 35660A',
+                        -4: 'HP 3562A, HP 3563A', -5: 'HP 3588A',
+                        -6: 'HP 3589A', -99: 'Unknown',
+                        1: 'HP 3566A, HP 3567A', 2: 'HP 35665A',
+                        3: 'HP 3560A', 4: 'HP 89410A, HP 89440A',
+                        7: 'HP 35635R', 8: 'HP 35654A-S1A',
+                        9: 'HP 3569A', 10: 'HP 35670A', 11: 'HP 3587S'}
+
+_AVERAGE_TYPE_DECODER = ('None', 'RMS', 'RMS Exponential',
+                         'Vector', 'Vector Exponential',
+                         'Continuous Peak Hold', 'Peak')
+
+_MEAS_TYPE_DECODER = {-99: 'Unknown measurement',
+                      0: 'Spectrum measurement',
+                      1: 'Network measurement',
+                      2: 'Swept measurement',
+                      3: 'FFT measurement',
+                      4: 'Orders measurement',
+                      5: 'Octave measurement',
+                      6: 'Capture measurement',
+                      7: 'Correlation measurement',
+                      8: 'Histogram measurement',
+                      9: 'Swept network measurement',
+                      10: 'FFT network measurement',
+                      }
+
+_REAL_TIME_DECODER = ('Not continuous', 'Continuous')
+
+_DETECTION_DECODER = {-99: 'Unknown detection type',
+                      0: 'Sample detection',
+                      1: 'Positive peak detection',
+                      2: 'Negative peak detection',
+                      3: 'Rose-and-fell detection'}
+
+_DOMAIN_DECODER = {-99: 'Unknown',
+                   0: 'Frequency domain',
+                   1: 'Time domain',
+                   2: 'Amplitude domain',
+                   3: 'RPM',
+                   4: 'Order',
+                   5: 'Channel',
+                   6: 'Octave'}
+
+# The domains whose y-data needs the channel window correction.
+_WINDOW_CORRECTED_DOMAINS = frozenset(('Frequency domain', 'Channel'))
+
+_DATA_TYPE_DECODER = {-99: 'Unknown',
+                      0: 'Time',
+                      1: 'Linear spectrum',
+                      2: 'Auto-power spectrum',
+                      3: 'Cross-power spectrum',
+                      4: 'Frequency response',
+                      5: 'Auto-correlation',
+                      6: 'Cross-correlation',
+                      7: 'Impulse response',
+                      8: 'Ordinary coherence',
+                      9: 'Partial coherence',
+                      10: 'Multiple coherence',
+                      11: 'Full octave',
+                      12: 'Third octave',
+                      13: 'Convolution',
+                      14: 'Histogram',
+                      15: 'Probability density function',
+                      16: 'Cumulative density function,',
+                      17: 'Power spectrum order tracking',
+                      18: 'Composite power tracking',
+                      19: 'Phase order tracking',
+                      20: 'RPM spectral',
+                      21: 'Order ratio',
+                      22: 'Orbit',
+                      23: 'HP 35650 series calibration',
+                      24: 'Sine rms pwr data',
+                      25: 'Sine variance data',
+                      26: 'Sine range data',
+                      27: 'Sine settle time data',
+                      28: 'Sine integ time data',
+                      29: 'Sine source data',
+                      30: 'Sine overload data',
+                      31: 'Sine linear data',
+                      32: 'Synthesis',
+                      33: 'Curve fit weighting function',
+                      34: 'Frequency corrections (for capture)',
+                      35: 'All pass time data',
+                      36: 'Norm reference data',
+                      37: 'tachometer data',
+                      38: 'limit line data',
+                      39: 'twelfth octave data',
+                      40: 'S11 data',
+                      41: 'S21 data',
+                      42: 'S12 data',
+                      43: 'S22 data',
+                      44: 'PSD data',
+                      45: 'decimated time data',
+                      46: 'overload data',
+                      47: 'compressed time data',
+                      48: 'external trigger data',
+                      49: 'pressure data',
+                      50: 'intensity data',
+                      51: 'PI index data',
+                      52: 'velocity data',
+                      53: 'PV index data',
+                      54: 'sound power data',
+                      55: 'field indicator data',
+                      56: 'partial power data',
+                      57: 'Ln 1 data',
+                      58: 'Ln 10 data',
+                      59: 'Ln 50 data',
+                      60: 'Ln 90 data',
+                      61: 'Ln 99 data',
+                      62: 'Ln user data',
+                      63: 'T20 data',
+                      64: 'T30 data',
+                      65: 'RT60 data',
+                      66: 'average count data',
+                      68: ' IQ measured time',
+                      69: ' IQ measured spectrum',
+                      70: ' IQ reference time',
+                      71: ' IQ reference spectrum',
+                      72: ' IQ error magnitude',
+                      73: ' IQ error phase',
+                      74: ' IQ error vector time',
+                      75: ' IQ error vector spectrum',
+                      76: ' symbol table data',
+                      }
+
+_X_RESOLUTION_TYPE_DECODER = ('Linear', 'Logarithmic',
+                              'Arbitrary, one per file',
+                              'Arbitrary, one per data type',
+                              'Arbitrary, one per trace')
+
+_X_DATA_TYPE_DECODER = ('Unknown', 'short', 'long', 'float', 'double')
+
+_Y_DATA_TYPE_DECODER = ('Unknown', 'short', 'long', 'float', 'double')
+
+_Y_DATA_DTYPE = {'short': '>i2', 'long': '>i4',
+                 'float': '>f4', 'double': '>f8'}
+
+_WEIGHT_DECODER = ('No weighting', 'A-weighting',
+                   'B-weighting', 'C-weighting')
+
+_DIRECTION_DECODER = {-9: '-TZ', -8: '-TY', -7: '-TX', -3: '-Z',
+                      -2: '-Y', -1: 'X', 0: 'No direction specified',
+                      1: 'X', 2: 'Y', 3: 'Z', 4: 'Radial',
+                      5: 'Tangential, theta angle',
+                      6: 'Tangential, phi angle', 7: 'TX',
+                      8: 'TY', 9: 'TZ'}
+
+_COUPLING_DECODER = ('DC', 'AC')
+
+_CHANNEL_ATTRIBUTE_DECODER = {-99: 'Unknown attribute', 0: 'No attribute',
+                              1: 'Tach attribute', 2: 'Reference attribute',
+                              3: 'Tach and reference attribute',
+                              4: 'Clockwise attribute'}
+
+_SCAN_TYPE_DECODER = ('Depth', 'Scan')
+
+_SCAN_VAR_TYPE_DECODER = ('Unknown', 'Short', 'Long', 'Float', 'Double')
+
+
+class SDFFormatError(ValueError):
+    """Raised when an SDF file doesn't have the expected structure."""
+
 
 class SDFFileHdrBase(TypedDict):
     record_size: int
     sdf_revision: int
     application: str
-    measurement_start_datetime: datetime
+    measurement_start_datetime: datetime | None
     application_version: str
     num_data_hdr_records: int
     num_vector_hdr_records: int
@@ -204,8 +437,8 @@ class SDFUnit(TypedDict):
 
 
 class SDFWindow(TypedDict):
-    window_type: int
-    correction_mode: int
+    window_type: str
+    correction_mode: str
     bw: float
     time_const: float
     trunc: float
@@ -248,51 +481,54 @@ def _strip_nonprintable(input_bytes: bytes) -> str:
     Convert a bytes object into a string returning any character up to, but not
     including, the first instance of \x00.
     """
-    return input_bytes.decode('utf-8', 'replace').split('\x00', 1)[0]
-
-
-def _decode_sdf_unit(binary_data: bytes) -> SDFUnit:
-    values = struct.unpack('>10sf8b', binary_data)
-    keys = ('label', 'factor', 'mass', 'length', 'time', 'current',
-            'temperature', 'luminal_intensity', 'mole',
-            'plane_angle')
-    unit_dict = dict(zip(keys, values))
-    unit_dict['label'] = _strip_nonprintable(unit_dict['label'])
-    return cast(SDFUnit, unit_dict)
-
-
-def _decode_sdf_window(binary_data: bytes) -> SDFWindow:
-    values = struct.unpack(b'>2h5f', binary_data)
-    keys = ('window_type', 'correction_mode', 'bw', 'time_const',
-            'trunc', 'wide_band_corr', 'narrow_band_corr')
-    window_dict = dict(zip(keys, values))
-    window_type_decoder = {0: 'Window not applied',
-                           1: 'Hanning',
-                           2: 'Flat Top',
-                           3: 'Uniform',
-                           4: 'Force',
-                           5: 'Response',
-                           6: 'user-defined',
-                           7: 'Hamming',
-                           8: 'P301',
-                           9: 'P310',
-                           10: 'Kaiser-Bessel',
-                           11: 'Harris',
-                           12: 'Blackman',
-                           13: 'Resolution filter',
-                           14: 'Correlation Lead Lag',
-                           15: 'Correlation Lag',
-                           16: 'Gated',
-                           17: 'P400',
-                           }
-    window_dict['window_type'] = window_type_decoder[
-        window_dict['window_type']]
-    correction_mode_decoder = {0: 'Correction not applied',
-                               1: 'Narrow band correction applied',
-                               2: 'Wide band correction applied'}
-    window_dict['correction_mode'] = correction_mode_decoder[
-        window_dict['correction_mode']]
-    return cast(SDFWindow, window_dict)
+    return input_bytes.partition(b'\x00')[0].decode('utf-8', 'replace')
+
+
+def _decode_dense_code(decoder: tuple, code: int) -> str:
+    """Look up a code in a tuple decoder, returning 'Unknown' if it's absent.
+
+    The coded fields are signed shorts, so this check is what keeps negative or
+    out of range codes from indexing the tuple.
+    """
+    return decoder[code] if 0 <= code < len(decoder) else 'Unknown'
+
+
+@functools.lru_cache(maxsize=256)
+def _decode_cached_sdf_unit(unit_bytes: bytes) -> SDFUnit:
+    (label, factor, mass, length, time, current, temperature,
+        luminal_intensity, mole, plane_angle) = _UNIT_STRUCT.unpack(unit_bytes)
+    return {'label': _strip_nonprintable(label), 'factor': factor,
+            'mass': mass, 'length': length, 'time': time,
+            'current': current, 'temperature': temperature,
+            'luminal_intensity': luminal_intensity, 'mole': mole,
+            'plane_angle': plane_angle}
+
+
+@functools.lru_cache(maxsize=256)
+def _decode_cached_sdf_window(window_bytes: bytes) -> SDFWindow:
+    (coded_window_type, coded_correction_mode, bw, time_const, trunc,
+        wide_band_corr, narrow_band_corr) = _WINDOW_STRUCT.unpack(window_bytes)
+    return {'window_type':
+            _decode_dense_code(_WINDOW_TYPE_DECODER, coded_window_type),
+            'correction_mode':
+            _decode_dense_code(
+                _CORRECTION_MODE_DECODER, coded_correction_mode),
+            'bw': bw, 'time_const': time_const, 'trunc': trunc,
+            'wide_band_corr': wide_band_corr,
+            'narrow_band_corr': narrow_band_corr}
+
+
+def _decode_sdf_unit(binary_data: memoryview, offset: int = 0) -> SDFUnit:
+    # Files tend to repeat the same few units, so the decoded units are
+    # cached by the raw record bytes and each caller gets its own copy.
+    return _decode_cached_sdf_unit(
+        bytes(binary_data[offset:offset + _UNIT_STRUCT.size])).copy()
+
+
+def _decode_sdf_window(
+        binary_data: memoryview, offset: int = 0) -> SDFWindow:
+    return _decode_cached_sdf_window(
+        bytes(binary_data[offset:offset + _WINDOW_STRUCT.size])).copy()
 
 
 def read_ascii_files(input_ascii_base_filename):
@@ -301,17 +537,18 @@ def read_ascii_files(input_ascii_base_filename):
     ascii_xdata_filename = input_ascii_base_filename + '.X'
 
     # Read the x and y data
-    xdata = np.loadtxt(ascii_xdata_filename)
-    ydata = np.loadtxt(ascii_ydata_filename)
+    # NumPy >= 1.23 parses these purely numeric files with its C tokenizer.
+    xdata = np.loadtxt(ascii_xdata_filename, dtype=np.float64)
+    ydata = np.loadtxt(ascii_ydata_filename, dtype=np.float64)
 
     # Return the x and y data as a structured array
-    return np.core.records.fromarrays(
+    return np.rec.fromarrays(
         [xdata, ydata], names='frequency,amplitude')
 
 
 def _decode_sdf_file_hdr(
         record_size: int,
-        binary_data: bytes) -> SDFFileHdrV1 | SDFFileHdrV2 | SDFFileHdrV3:
+        binary_data: memoryview) -> SDFFileHdrV1 | SDFFileHdrV2 | SDFFileHdrV3:
     """Decode the header information in the SDF file.
 
     Note: The HP documentation lists the binary indices starting a 1, whereas
@@ -327,35 +564,34 @@ def _decode_sdf_file_hdr(
         A dictionary containing the SDF header information.
     """
 
-    file_hdr: Dict[str, Union[int, str, datetime]] = {}
+    file_hdr: Dict[str, Union[int, str, datetime, None]] = {}
+    (sdf_revision, application_code,
+        msr_year, msr_month_day, msr_hour_min, application_version,
+        *record_counts_and_offsets) = \
+        _FILE_HDR_STRUCT.unpack_from(binary_data, 6)
+    # Fill the header in the order its keys have always been listed in.
     file_hdr['record_size'] = record_size
-    file_hdr['sdf_revision'], = struct.unpack('>h', binary_data[6:8])
-    application_code, = struct.unpack('>h', binary_data[8:10])
-    application_decoder = {-1: 'HP VISTA', -2: 'HP SINE', -3: 'HP 35660A',
-                           -4: 'HP 3562A, HP 3563A', -5: 'HP 3588A',
-                           -6: 'HP 3589A', -99: 'Unknown',
-                           1: 'HP 3566A, HP 3567A', 2: 'HP 35665A',
-                           3: 'HP 3560A', 4: 'HP 89410A, HP 89440A',
-                           7: 'HP 35635R', 8: 'HP 35654A-S1A',
-                           9: 'HP 3569A', 10: 'HP 35670A', 11: 'HP 3587S'}
-    file_hdr['application'] = application_decoder[application_code]
-    msr_year, msr_month_day, msr_hour_min = struct.unpack(
-        '>hhh', binary_data[10:16])
+    file_hdr['sdf_revision'] = sdf_revision
+    file_hdr['application'] = _APPLICATION_DECODER.get(
+        application_code, 'Unknown')
+    # The month and day, and the hour and minute, are each packed into a
+    # single short as month * 100 + day and hour * 100 + minute.
     msr_month, msr_day = divmod(msr_month_day, 100)
-    msr_hour, msr_sec = divmod(msr_hour_min, 100)
-    file_hdr['measurement_start_datetime'] = datetime(
-        msr_year, msr_month, msr_day, msr_hour, msr_sec)
-    file_hdr['application_version'] = _strip_nonprintable(
-        struct.unpack('>8s', binary_data[16:24])[0])
+    msr_hour, msr_min = divmod(msr_hour_min, 100)
+    try:
+        file_hdr['measurement_start_datetime'] = datetime(
+            msr_year, msr_month, msr_day, msr_hour, msr_min)
+    except ValueError:
+        # Don't give up on the whole file because of a bad timestamp.
+        file_hdr['measurement_start_datetime'] = None
+    file_hdr['application_version'] = _strip_nonprintable(application_version)
     (file_hdr['num_data_hdr_records'], file_hdr['num_vector_hdr_records'],
         file_hdr['num_channel_hdr_records'], file_hdr['num_unique_records'],
-        file_hdr['num_scan_struct_records'], file_hdr['num_xdata_records']) = \
-        struct.unpack('>6h', binary_data[24:36])
-    (file_hdr['offset_data_hdr_record'], file_hdr['offset_vector_record'],
+        file_hdr['num_scan_struct_records'], file_hdr['num_xdata_records'],
+        file_hdr['offset_data_hdr_record'], file_hdr['offset_vector_record'],
         file_hdr['offset_channel_record'], file_hdr['offset_unique_record'],
         file_hdr['offset_scan_struct_record'], file_hdr['offset_xdata_record'],
-        file_hdr['offset_ydata_record']) = \
-        struct.unpack('>7l', binary_data[36:64])
+        file_hdr['offset_ydata_record']) = record_counts_and_offsets
 
     if file_hdr['sdf_revision'] == 1:
         temp_file_hdr = cast(SDFFileHdrV1, file_hdr)
@@ -367,7 +603,7 @@ def _decode_sdf_file_hdr(
         temp_file_hdr = cast(SDFFileHdrV3, file_hdr)
     else:
         # SDF revision not recognized
-        sys.exit('Did not recognize SDF revision in file header.')
+        raise SDFFormatError('Did not recognize SDF revision in file header.')
 
     return temp_file_hdr
 
@@ -375,59 +611,40 @@ def _decode_sdf_file_hdr(
 def _decode_sdf_meas_hdr(
         record_size: int,
         sdf_revision: int,
-        binary_data: bytes) -> SDFMeasHdrV1 | SDFMeasHdrV2 | SDFMeasHdrV3:
+        binary_data: memoryview) -> SDFMeasHdrV1 | SDFMeasHdrV2 | SDFMeasHdrV3:
     '''
     Decode the measurement header binary data
     '''
     meas_hdr: dict = {}
     # FIXME(mdr): Check that the record_type is 11 (short int 0:2).
-    record_size_from_binary_data = struct.unpack('>l', binary_data[2:6])[0]
+    record_size_from_binary_data = int.from_bytes(
+        binary_data[2:6], 'big', signed=True)
     if record_size != record_size_from_binary_data:
-        sys.exit('Bad record size in SDF_MEAS_HDR')
+        raise SDFFormatError('Bad record size in SDF_MEAS_HDR')
+    (offset_unique_record, block_size, zoom_mode_on, start_freq_index,
+        stop_freq_index, coded_average_type, average_num, pct_overlap,
+        meas_title, video_bw, center_freq, span_freq, sweep_freq,
+        coded_meas_type, coded_real_time, coded_detection, sweep_time) = \
+        _MEAS_HDR_STRUCT.unpack_from(binary_data, 6)
+    # Fill the header in the order its keys have always been listed in.
     meas_hdr['record_size'] = record_size
-    (meas_hdr['offset_unique_record'],) = struct.unpack(
-        b'>1l', binary_data[6:10])
-    meas_hdr['block_size'], = struct.unpack('>l', binary_data[18:22])
-    meas_hdr['zoom_mode_on'], = struct.unpack('>h', binary_data[22:24])
-    meas_hdr['zoom_mode_on'] = bool(meas_hdr['zoom_mode_on'])
-    coded_average_type, = struct.unpack('>h', binary_data[28:30])
-    average_type_decoder = {0: 'None', 1: 'RMS', 2: 'RMS Exponential',
-                            3: 'Vector', 4: 'Vector Exponential',
-                            5: 'Continuous Peak Hold', 6: 'Peak'}
-    meas_hdr['average_type'] = average_type_decoder[coded_average_type]
-    meas_hdr['average_num'], = struct.unpack('>l', binary_data[30:34])
-    meas_hdr['pct_overlap'], = struct.unpack(b'>f', binary_data[34:38])
-    meas_hdr['meas_title'] = _strip_nonprintable(binary_data[38:98])
-    meas_hdr['video_bw'], = struct.unpack('>f', binary_data[98:102])
-    (meas_hdr['center_freq'], meas_hdr['span_freq'],
-        meas_hdr['sweep_freq']) = struct.unpack(
-            b'>3d', binary_data[102:126])
-    coded_meas_type, = struct.unpack('>h', binary_data[126:128])
-    meas_type_decoder = {-99: 'Unknown measurement',
-                         0: 'Spectrum measurement',
-                         1: 'Network measurement',
-                         2: 'Swept measurement',
-                         3: 'FFT measurement',
-                         4: 'Orders measurement',
-                         5: 'Octave measurement',
-                         6: 'Capture measurement',
-                         7: 'Correlation measurement',
-                         8: 'Histogram measurement',
-                         9: 'Swept network measurement',
-                         10: 'FFT network measurement',
-                         }
-    meas_hdr['meas_type'] = meas_type_decoder[coded_meas_type]
-    coded_real_time, = struct.unpack('>h', binary_data[128:130])
-    real_time_decoder = {0: 'Not continuous', 1: 'Continuous'}
-    meas_hdr['real_time'] = real_time_decoder[coded_real_time]
-    coded_detection, = struct.unpack('>h', binary_data[130:132])
-    detection_decoder = {-99: 'Unknown detection type',
-                         0: 'Sample detection',
-                         1: 'Positive peak detection',
-                         2: 'Negative peak detection',
-                         3: 'Rose-and-fell detection'}
-    meas_hdr['detection'] = detection_decoder[coded_detection]
-    meas_hdr['sweep_time'], = struct.unpack(b'>d', binary_data[132:140])
+    meas_hdr['offset_unique_record'] = offset_unique_record
+    meas_hdr['block_size'] = block_size
+    meas_hdr['zoom_mode_on'] = bool(zoom_mode_on)
+    meas_hdr['average_type'] = _decode_dense_code(
+        _AVERAGE_TYPE_DECODER, coded_average_type)
+    meas_hdr['average_num'] = average_num
+    meas_hdr['pct_overlap'] = pct_overlap
+    meas_hdr['meas_title'] = _strip_nonprintable(meas_title)
+    meas_hdr['video_bw'] = video_bw
+    meas_hdr['center_freq'] = center_freq
+    meas_hdr['span_freq'] = span_freq
+    meas_hdr['sweep_freq'] = sweep_freq
+    meas_hdr['meas_type'] = _MEAS_TYPE_DECODER.get(coded_meas_type, 'Unknown')
+    meas_hdr['real_time'] = _decode_dense_code(
+        _REAL_TIME_DECODER, coded_real_time)
+    meas_hdr['detection'] = _DETECTION_DECODER.get(coded_detection, 'Unknown')
+    meas_hdr['sweep_time'] = sweep_time
 
     if sdf_revision == 1:
         # Decode the revision 1 stuff
@@ -435,8 +652,8 @@ def _decode_sdf_meas_hdr(
         temp_meas_hdr = cast(SDFMeasHdrV1, meas_hdr)
     elif sdf_revision == 2:
         # Decode the revision 2 stuff
-        (meas_hdr['start_freq_index'], meas_hdr['stop_freq_index']) = \
-            struct.unpack(b'>2h', binary_data[24:28])
+        meas_hdr['start_freq_index'] = start_freq_index
+        meas_hdr['stop_freq_index'] = stop_freq_index
         temp_meas_hdr = cast(SDFMeasHdrV2, meas_hdr)
     elif sdf_revision == 3:
         # Decode the revision 3 related stuff
@@ -444,278 +661,284 @@ def _decode_sdf_meas_hdr(
         temp_meas_hdr = cast(SDFMeasHdrV3, meas_hdr)
     else:
         # SDF revision not recognized
-        sys.exit('Did not recognize SDF revision passed to meas hdr.')
+        raise SDFFormatError(
+            'Did not recognize SDF revision passed to meas hdr.')
 
     return temp_meas_hdr
 
 
-def _decode_sdf_data_hdr(
+def _decode_sdf_data_hdr_common(
         record_size: int,
-        sdf_revision: int,
-        binary_data: bytes) -> Union[SDFDataHdrV1, SDFDataHdrV2]:
+        binary_data: memoryview) -> tuple[dict, int, int]:
     '''
-    Decode the data header binary data
+    Decode the data header fields shared by every SDF revision
+
+    Returns the partly decoded header, along with the number of points and
+    last valid index, which are only meaningful from revision 2.
     '''
     data_hdr: dict = {}
+    (offset_unique_record, data_title, coded_domain, coded_data_type,
+        num_points, last_valid_index, coded_x_resolution_type,
+        coded_x_data_type, x_per_point, coded_y_data_type, y_per_point,
+        y_is_complex, y_is_normalized, y_is_power_data, y_is_valid,
+        first_vector_record_num, total_rows, total_cols, y_unit_valid) = \
+        _DATA_HDR_STRUCT.unpack_from(binary_data, 6)
+    # Fill the header in the order its keys have always been listed in.
     data_hdr['record_size'] = record_size
-    (data_hdr['offset_unique_record'],) = \
-        struct.unpack('>1l', binary_data[6:10])
-    data_hdr['data_title'] = _strip_nonprintable(
-        struct.unpack(b'>16s', binary_data[10:26])[0])
-    coded_domain, = struct.unpack('>h', binary_data[26:28])
-    domain_decoder = {-99: 'Unknown',
-                      0: 'Frequency domain',
-                      1: 'Time domain',
-                      2: 'Amplitude domain',
-                      3: 'RPM',
-                      4: 'Order',
-                      5: 'Channel',
-                      6: 'Octave'}
-    data_hdr['domain'] = domain_decoder[coded_domain]
-    coded_data_type, = struct.unpack('>h', binary_data[28:30])
-    data_type_decoder = {-99: 'Unknown',
-                         0: 'Time',
-                         1: 'Linear spectrum',
-                         2: 'Auto-power spectrum',
-                         3: 'Cross-power spectrum',
-                         4: 'Frequency response',
-                         5: 'Auto-correlation',
-                         6: 'Cross-correlation',
-                         7: 'Impulse response',
-                         8: 'Ordinary coherence',
-                         9: 'Partial coherence',
-                         10: 'Multiple coherence',
-                         11: 'Full octave',
-                         12: 'Third octave',
-                         13: 'Convolution',
-                         14: 'Histogram',
-                         15: 'Probability density function',
-                         16: 'Cumulative density function,',
-                         17: 'Power spectrum order tracking',
-                         18: 'Composite power tracking',
-                         19: 'Phase order tracking',
-                         20: 'RPM spectral',
-                         21: 'Order ratio',
-                         22: 'Orbit',
-                         23: 'HP 35650 series calibration',
-                         24: 'Sine rms pwr data',
-                         25: 'Sine variance data',
-                         26: 'Sine range data',
-                         27: 'Sine settle time data',
-                         28: 'Sine integ time data',
-                         29: 'Sine source data',
-                         30: 'Sine overload data',
-                         31: 'Sine linear data',
-                         32: 'Synthesis',
-                         33: 'Curve fit weighting function',
-                         34: 'Frequency corrections (for capture)',
-                         35: 'All pass time data',
-                         36: 'Norm reference data',
-                         37: 'tachometer data',
-                         38: 'limit line data',
-                         39: 'twelfth octave data',
-                         40: 'S11 data',
-                         41: 'S21 data',
-                         42: 'S12 data',
-                         43: 'S22 data',
-                         44: 'PSD data',
-                         45: 'decimated time data',
-                         46: 'overload data',
-                         47: 'compressed time data',
-                         48: 'external trigger data',
-                         49: 'pressure data',
-                         50: 'intensity data',
-                         51: 'PI index data',
-                         52: 'velocity data',
-                         53: 'PV index data',
-                         54: 'sound power data',
-                         55: 'field indicator data',
-                         56: 'partial power data',
-                         57: 'Ln 1 data',
-                         58: 'Ln 10 data',
-                         59: 'Ln 50 data',
-                         60: 'Ln 90 data',
-                         61: 'Ln 99 data',
-                         62: 'Ln user data',
-                         63: 'T20 data',
-                         64: 'T30 data',
-                         65: 'RT60 data',
-                         66: 'average count data',
-                         68: ' IQ measured time',
-                         69: ' IQ measured spectrum',
-                         70: ' IQ reference time',
-                         71: ' IQ reference spectrum',
-                         72: ' IQ error magnitude',
-                         73: ' IQ error phase',
-                         74: ' IQ error vector time',
-                         75: ' IQ error vector spectrum',
-                         76: ' symbol table data',
-                         }
-    data_hdr['data_type'] = data_type_decoder[coded_data_type]
-    coded_x_resolution_type, = struct.unpack('>h', binary_data[42:44])
-    x_resolution_type_decoder = {0: 'Linear', 1: 'Logarithmic',
-                                 2: 'Arbitrary, one per file',
-                                 3: 'Arbitrary, one per data type',
-                                 4: 'Arbitrary, one per trace'}
+    data_hdr['offset_unique_record'] = offset_unique_record
+    data_hdr['data_title'] = _strip_nonprintable(data_title)
+    data_hdr['domain'] = _DOMAIN_DECODER.get(coded_domain, 'Unknown')
+    data_hdr['data_type'] = _DATA_TYPE_DECODER.get(coded_data_type, 'Unknown')
     data_hdr['x_resolution_type'] = \
-        x_resolution_type_decoder[coded_x_resolution_type]
-    coded_x_data_type, = struct.unpack('>h', binary_data[44:46])
-    x_data_type_decoder = {1: 'short', 2: 'long', 3: 'float', 4: 'double'}
-    data_hdr['x_data_type'] = x_data_type_decoder[coded_x_data_type]
-    data_hdr['x_per_point'], = struct.unpack('>h', binary_data[46:48])
-    coded_y_data_type, = struct.unpack('>h', binary_data[48:50])
-    y_data_type_decoder = {1: 'short', 2: 'long', 3: 'float', 4: 'double'}
-    data_hdr['y_data_type'] = y_data_type_decoder[coded_y_data_type]
-    data_hdr['y_per_point'], = struct.unpack('>h', binary_data[50:52])
-    data_hdr['y_is_complex'], = struct.unpack('>h', binary_data[52:54])
-    data_hdr['y_is_complex'] = bool(data_hdr['y_is_complex'])
-    data_hdr['y_is_normalized'], = struct.unpack('>h', binary_data[54:56])
-    data_hdr['y_is_normalized'] = bool(data_hdr['y_is_normalized'])
-    data_hdr['y_is_power_data'], = struct.unpack('>h', binary_data[56:58])
-    data_hdr['y_is_power_data'] = bool(data_hdr['y_is_power_data'])
-    data_hdr['y_is_valid'], = struct.unpack('>h', binary_data[58:60])
-    data_hdr['y_is_valid'] = bool(data_hdr['y_is_valid'])
-    data_hdr['first_vector_record_num'], = struct.unpack(
-        '>l', binary_data[60:64])
-    data_hdr['total_rows'], data_hdr['total_cols'] = struct.unpack(
-        '>2h', binary_data[64:68])
-    data_hdr['xunit'] = _decode_sdf_unit(binary_data[68:90])
-    data_hdr['y_unit_valid'], = struct.unpack('>h', binary_data[90:92])
-    data_hdr['y_unit_valid'] = bool(data_hdr['y_unit_valid'])
-    data_hdr['yunit'] = _decode_sdf_unit(binary_data[92:114])
-
-    if sdf_revision == 1:
-        # Decode the revision 1 stuff
-        # FIXME: Add rev 1 stuff later
-        (data_hdr['abscissa_first_x'], data_hdr['abscissa_delta_x']) = \
-            struct.unpack('>2f', binary_data[34:42])
-        temp_data_hdr = cast(SDFDataHdrV1, data_hdr)
-    elif sdf_revision == 2:
-        # Decode the revision 2 stuff
-        (data_hdr['num_points'], data_hdr['last_valid_index']) = \
-            struct.unpack('>2h', binary_data[30:34])
-        (data_hdr['abscissa_first_x'], data_hdr['abscissa_delta_x']) = \
-            struct.unpack(b'>2d', binary_data[114:130])
-        data_hdr['scan_data'], = struct.unpack('>h', binary_data[130:132])
-        data_hdr['scan_data'] = bool(data_hdr['scan_data'])
-        data_hdr['window_applied'], = struct.unpack('>h', binary_data[132:134])
-        data_hdr['window_applied'] = bool(data_hdr['window_applied'])
-        temp_data_hdr = cast(SDFDataHdrV2, data_hdr)
-    elif sdf_revision == 3:
-        # Decode the revision 3 related stuff
-        # FIXME: Add rev 3 stuff later
-        pass
-    else:
-        # SDF revision not recognized
-        sys.exit('Did not recognize SDF revision')
-
-    return temp_data_hdr
+        _decode_dense_code(
+            _X_RESOLUTION_TYPE_DECODER, coded_x_resolution_type)
+    data_hdr['x_data_type'] = _decode_dense_code(
+        _X_DATA_TYPE_DECODER, coded_x_data_type)
+    data_hdr['x_per_point'] = x_per_point
+    data_hdr['y_data_type'] = _decode_dense_code(
+        _Y_DATA_TYPE_DECODER, coded_y_data_type)
+    data_hdr['y_per_point'] = y_per_point
+    data_hdr['y_is_complex'] = bool(y_is_complex)
+    data_hdr['y_is_normalized'] = bool(y_is_normalized)
+    data_hdr['y_is_power_data'] = bool(y_is_power_data)
+    data_hdr['y_is_valid'] = bool(y_is_valid)
+    data_hdr['first_vector_record_num'] = first_vector_record_num
+    data_hdr['total_rows'] = total_rows
+    data_hdr['total_cols'] = total_cols
+    data_hdr['xunit'] = _decode_sdf_unit(binary_data, 68)
+    data_hdr['y_unit_valid'] = bool(y_unit_valid)
+    data_hdr['yunit'] = _decode_sdf_unit(binary_data, 92)
+    return data_hdr, num_points, last_valid_index
+
+
+def _decode_sdf_data_hdr_v1(
+        record_size: int,
+        binary_data: memoryview) -> SDFDataHdrV1:
+    '''
+    Decode the revision 1 data header binary data
+    '''
+    data_hdr, _, _ = _decode_sdf_data_hdr_common(record_size, binary_data)
+    # FIXME: Add rev 1 stuff later
+    (data_hdr['abscissa_first_x'], data_hdr['abscissa_delta_x']) = \
+        _DATA_HDR_V1_STRUCT.unpack_from(binary_data, 34)
+    return cast(SDFDataHdrV1, data_hdr)
 
 
-def _decode_sdf_vector_hdr(
+def _decode_sdf_data_hdr_v2(
         record_size: int,
-        sdf_revision: int,
-        binary_data: bytes) -> SDFVectorHdr:
+        binary_data: memoryview) -> SDFDataHdrV2:
     '''
-    Decode the vector header binary data
+    Decode the revision 2 data header binary data
     '''
-    vector_hdr: dict = {}
-    vector_hdr['record_size'] = record_size
-    (vector_hdr['offset_unique_record'],) = \
-        struct.unpack('>l', binary_data[6:10])
-    vector_hdr['channel_record'] = struct.unpack('>2h', binary_data[10:14])
-    vector_hdr['channel_power_48x'] = struct.unpack('>2h', binary_data[14:18])
+    data_hdr, num_points, last_valid_index = _decode_sdf_data_hdr_common(
+        record_size, binary_data)
+    data_hdr['num_points'] = num_points
+    data_hdr['last_valid_index'] = last_valid_index
+    (data_hdr['abscissa_first_x'], data_hdr['abscissa_delta_x'],
+        scan_data, window_applied) = \
+        _DATA_HDR_V2_STRUCT.unpack_from(binary_data, 114)
+    data_hdr['scan_data'] = bool(scan_data)
+    data_hdr['window_applied'] = bool(window_applied)
+    return cast(SDFDataHdrV2, data_hdr)
+
+
+def _decode_sdf_data_hdr_v3(
+        record_size: int,
+        binary_data: memoryview) -> SDFDataHdrV3:
+    '''
+    Decode the revision 3 data header binary data
+    '''
+    # FIXME: Add rev 3 stuff later. Until then, decode the fields revision 3
+    # shares with revision 2.
+    return cast(SDFDataHdrV3,
+                _decode_sdf_data_hdr_v2(record_size, binary_data))
 
-    return cast(SDFVectorHdr, vector_hdr)
 
+# The data header decoder for each SDF revision, so the revision is only
+# looked up once per file rather than once per record.
+_DATA_HDR_DECODERS = {1: _decode_sdf_data_hdr_v1,
+                      2: _decode_sdf_data_hdr_v2,
+                      3: _decode_sdf_data_hdr_v3}
 
-def _decode_sdf_channel_hdr(
+
+def _decode_sdf_vector_hdrs(
         record_size: int,
         sdf_revision: int,
-        binary_data: bytes) -> SDFChannelHdr:
-    """Decode the channel header binary data to a dictionary.
+        num_records: int,
+        binary_data: memoryview) -> list[SDFVectorHdr]:
+    '''
+    Decode a contiguous block of equally sized vector header records
+    '''
+    vector_hdr_dtype = np.dtype(
+        cast(Any, dict(_VECTOR_HDR_FIELDS, itemsize=record_size)))
+    vector_hdr_records = np.frombuffer(
+        binary_data, dtype=vector_hdr_dtype, count=num_records)
+    # Confirm these are all vector header records.
+    if np.any(vector_hdr_records['record_type'] != VECTOR_HDR_RECORD_TYPE):
+        raise SDFFormatError('This should have been a vector header record.')
+
+    return [
+        cast(SDFVectorHdr, {
+            'record_size': record_size,
+            'offset_unique_record': offset_unique_record,
+            'channel_record': tuple(channel_record),
+            'channel_power_48x': tuple(channel_power_48x)})
+        for (offset_unique_record, channel_record, channel_power_48x) in zip(
+            vector_hdr_records['offset_unique_record'].tolist(),
+            vector_hdr_records['channel_record'].tolist(),
+            vector_hdr_records['channel_power_48x'].tolist())]
+
+
+def _decode_sdf_channel_hdrs(
+        record_size: int,
+        sdf_revision: int,
+        binary_data: memoryview) -> list[SDFChannelHdr]:
+    """Decode a contiguous block of equally sized channel header records to a
+    list of dictionaries.
     """
-    channel_hdr: dict = {}
-    channel_hdr['record_size'] = record_size
-    (channel_hdr['offset_unique_record'],) = \
-        struct.unpack('>l', binary_data[6:10])
-    channel_hdr['channel_label'] = _strip_nonprintable(
-        struct.unpack(b'>30s', binary_data[10:40])[0])
-    channel_hdr['module_id'] = _strip_nonprintable(
-        struct.unpack(b'>12s', binary_data[40:52])[0])
-    channel_hdr['serial_number'] = _strip_nonprintable(
-        struct.unpack('>12s', binary_data[52:64])[0])
-    channel_hdr['window'] = _decode_sdf_window(binary_data[64:88])
-    coded_weight, = struct.unpack('>h', binary_data[88:90])
-    weight_decoder = {0: 'No weighting', 1: 'A-weighting',
-                      2: 'B-weighting', 3: 'C-weighting'}
-    channel_hdr['weight'] = weight_decoder[coded_weight]
-    (channel_hdr['delay'], channel_hdr['range']) = struct.unpack(
-        b'>2f', binary_data[90:98])
-    coded_direction, = struct.unpack('>h', binary_data[98:100])
-    direction_decoder = {-9: '-TZ', -8: '-TY', -7: '-TX', -3: '-Z',
-                         -2: '-Y', -1: 'X', 0: 'No direction specified',
-                         1: 'X', 2: 'Y', 3: 'Z', 4: 'Radial',
-                         5: 'Tangential, theta angle',
-                         6: 'Tangential, phi angle', 7: 'TX',
-                         8: 'TY', 9: 'TZ'}
-    channel_hdr['direction'] = direction_decoder[coded_direction]
-    channel_hdr['point_num'], = struct.unpack('>h', binary_data[100:102])
-    coded_coupling, = struct.unpack('>h', binary_data[102:104])
-    coupling_decoder = {0: 'DC', 1: 'AC'}
-    channel_hdr['coupling'] = coupling_decoder[coded_coupling]
-    channel_hdr['overloaded'], = struct.unpack('>h', binary_data[104:106])
-    channel_hdr['overloaded'] = bool(channel_hdr['overloaded'])
-    channel_hdr['int_label'] = _strip_nonprintable(
-        struct.unpack(b'>10s', binary_data[106:116])[0])
-    channel_hdr['eng_unit'] = _decode_sdf_unit(binary_data[116:138])
-    channel_hdr['int_2_eng_unit'], = struct.unpack('>f', binary_data[138:142])
-    channel_hdr['input_impedance'], = struct.unpack('>f', binary_data[142:146])
-    coded_channel_attribute, = struct.unpack('>h', binary_data[146:148])
-    channel_attribute_decoder = {-99: 'Unknown attribute', 0: 'No attribute',
-                                 1: 'Tach attribute', 2: 'Reference attribute',
-                                 3: 'Tach and reference attribute',
-                                 4: 'Clockwise attribute'}
-    channel_hdr['channel_attribute'] = \
-        channel_attribute_decoder[coded_channel_attribute]
-    channel_hdr['alias_protected'], = struct.unpack('>h', binary_data[148:150])
-    channel_hdr['alias_protected'] = bool(channel_hdr['alias_protected'])
-    channel_hdr['digital_channel'], = struct.unpack('>h', binary_data[150:152])
-    channel_hdr['digital_channel'] = bool(channel_hdr['digital_channel'])
-    (channel_hdr['channel_scale'], channel_hdr['channel_offset'],
-        channel_hdr['gate_begin'], channel_hdr['gate_end'],
-        channel_hdr['user_delay']) = struct.unpack(
-            b'>5d', binary_data[152:192])
-
-    return cast(SDFChannelHdr, channel_hdr)
+    channel_hdr_struct = _CHANNEL_HDR_STRUCT
+    if record_size != channel_hdr_struct.size:
+        # Skip any trailing bytes that aren't decoded.
+        num_trailing_bytes = record_size - _CHANNEL_HDR_STRUCT.size
+        channel_hdr_struct = struct.Struct(
+            f'{_CHANNEL_HDR_STRUCT.format}{num_trailing_bytes}x')
+
+    channel_hdrs = []
+    for record_offset, (
+            record_type, _, offset_unique_record, channel_label, module_id,
+            serial_number, coded_weight, delay, channel_range,
+            coded_direction, point_num, coded_coupling, overloaded,
+            int_label, int_2_eng_unit, input_impedance,
+            coded_channel_attribute, alias_protected, digital_channel,
+            channel_scale, channel_offset, gate_begin, gate_end,
+            user_delay) in zip(range(0, len(binary_data), record_size),
+                               channel_hdr_struct.iter_unpack(binary_data)):
+        # Confirm this is a channel header record.
+        if record_type != CHANNEL_HDR_RECORD_TYPE:
+            raise SDFFormatError(
+                'This should have been a channel header record.')
+        channel_hdrs.append(cast(SDFChannelHdr, {
+            'record_size': record_size,
+            'offset_unique_record': offset_unique_record,
+            'channel_label': _strip_nonprintable(channel_label),
+            'module_id': _strip_nonprintable(module_id),
+            'serial_number': _strip_nonprintable(serial_number),
+            'window': _decode_sdf_window(binary_data, record_offset + 64),
+            'weight': _decode_dense_code(_WEIGHT_DECODER, coded_weight),
+            'delay': delay,
+            'range': channel_range,
+            'direction': _DIRECTION_DECODER.get(coded_direction, 'Unknown'),
+            'point_num': point_num,
+            'coupling': _decode_dense_code(_COUPLING_DECODER, coded_coupling),
+            'overloaded': bool(overloaded),
+            'int_label': _strip_nonprintable(int_label),
+            'eng_unit': _decode_sdf_unit(binary_data, record_offset + 116),
+            'int_2_eng_unit': int_2_eng_unit,
+            'input_impedance': input_impedance,
+            'channel_attribute':
+                _CHANNEL_ATTRIBUTE_DECODER.get(
+                    coded_channel_attribute, 'Unknown'),
+            'alias_protected': bool(alias_protected),
+            'digital_channel': bool(digital_channel),
+            'channel_scale': channel_scale,
+            'channel_offset': channel_offset,
+            'gate_begin': gate_begin,
+            'gate_end': gate_end,
+            'user_delay': user_delay}))
+
+    return channel_hdrs
 
 
 def _decode_sdf_scan_struct(
         record_size: int,
         sdf_revision: int,
-        binary_data: bytes) -> SDFScanStruct:
+        binary_data: memoryview) -> SDFScanStruct:
     """Decode the scan structure binary data to a dictionary.
     """
     scan_struct: dict = {}
     scan_struct['record_size'] = record_size
-    scan_struct['num_of_scans'], = struct.unpack('>h', binary_data[6:8])
-    scan_struct['last_scan_index'], = struct.unpack('>h', binary_data[8:10])
-    coded_scan_type, = struct.unpack('>h', binary_data[10:12])
+    (scan_struct['num_of_scans'], scan_struct['last_scan_index'],
+        coded_scan_type, coded_scan_var_type) = \
+        _SCAN_STRUCT_STRUCT.unpack_from(binary_data, 6)
     # The HP Standard Data Foramt Utilties User's Guide shows 0 = Depth and
     # 1 = Scan.
     # However, the .DAT file created by 35670A shows 1 = Depth.
     # I'm going to believe the documentation
-    scan_type_decoder = {0: 'Depth', 1: 'Scan'}
-    scan_struct['scan_type'] = scan_type_decoder[coded_scan_type]
-    coded_scan_var_type, = struct.unpack('>h', binary_data[12:14])
-    scan_var_type_decoder = {1: 'Short', 2: 'Long', 3: 'Float',
-                             4: 'Double'}
-    scan_struct['scan_var_type'] = scan_var_type_decoder[coded_scan_var_type]
-    scan_struct['scan_unit'] = _decode_sdf_unit(binary_data[14:36])
+    scan_struct['scan_type'] = _decode_dense_code(
+        _SCAN_TYPE_DECODER, coded_scan_type)
+    scan_struct['scan_var_type'] = _decode_dense_code(
+        _SCAN_VAR_TYPE_DECODER, coded_scan_var_type)
+    scan_struct['scan_unit'] = _decode_sdf_unit(binary_data, 14)
 
     return cast(SDFScanStruct, scan_struct)
 
 
+def _channel_corr_factor(
+        window_corr: float, eu_corr: float, pwr_48x: int) -> float:
+    """Return the channel correction factor for a vector header power.
+
+    The power is stored as 48 times the exponent. It's nearly always 0, 1/2,
+    1 or 2, which are evaluated without the generic float pow.
+    """
+    ratio = window_corr / eu_corr
+    if pwr_48x == 0:
+        return 1.0
+    if pwr_48x == 48:
+        return ratio
+    if pwr_48x == 96:
+        return ratio * ratio
+    if pwr_48x == 24 and ratio >= 0:
+        return math.sqrt(ratio)
+    return ratio ** (pwr_48x / 48)
+
+
+def _decode_sdf_ydata(
+        data_hdr: dict,
+        binary_data: memoryview,
+        offset: int,
+        start_idx: int = 0,
+        stop_idx: int | None = None) -> np.ndarray:
+    """Decode the y-axis data described by a data header to an array.
+
+    Only the points from start_idx to stop_idx, inclusive, are decoded. The
+    array has one row per point when the data header has more than one value
+    per point.
+    """
+    if data_hdr['y_data_type'] not in _Y_DATA_DTYPE:
+        raise SDFFormatError(
+            f"Unknown y-axis data type: {data_hdr['y_data_type']}")
+    if data_hdr['y_per_point'] < 1:
+        raise SDFFormatError(
+            f"Bad y-axis values per point: {data_hdr['y_per_point']}")
+    dtype = np.dtype(_Y_DATA_DTYPE[data_hdr['y_data_type']])
+    values_per_point = data_hdr['y_per_point']
+    if data_hdr['y_is_complex']:
+        values_per_point *= 2
+    point_dtype = np.dtype((dtype, (values_per_point,)))
+    num_points = data_hdr['num_points']
+    if stop_idx is not None:
+        num_points = min(num_points, stop_idx + 1)
+    # Slicing the buffer keeps a truncated file, which holds fewer points than
+    # its data header claims, to the points that are actually present.
+    start_idx = min(max(start_idx, 0), max(num_points, 0))
+    point_bytes = binary_data[offset + start_idx * point_dtype.itemsize:
+                              offset + num_points * point_dtype.itemsize]
+    y_data: np.ndarray = np.frombuffer(
+        point_bytes,
+        dtype=point_dtype,
+        count=point_bytes.nbytes // point_dtype.itemsize)
+    if data_hdr['y_is_complex']:
+        if dtype.kind == 'f':
+            # Real and imaginary parts are stored as consecutive values,
+            # which is already the layout of a big-endian complex.
+            y_data = y_data.view(f'>c{2 * dtype.itemsize}')
+        else:
+            y_data = y_data[:, 0::2] + 1j * y_data[:, 1::2]
+    if data_hdr['y_per_point'] == 1:
+        y_data = y_data[:, 0]
+    return y_data
+
+
 def read_sdf_file(sdf_filename: str) -> tuple[Any, Any]:
     """Read the binary SDF file into a dictionary.
 
@@ -726,6 +949,78 @@ def read_sdf_file(sdf_filename: str) -> tuple[Any, Any]:
     Args:
         sdf_filename: A string containing the SDF filename to be read.
 
+    Returns:
+        A tuple containing a dictionary of the header information and a numpy
+            array containing the data.
+    """
+    # Every record is decoded from offsets into a single buffer holding the
+    # entire file. Slicing a memoryview doesn't copy the underlying bytes.
+    with open(sdf_filename, 'rb') as sdf_file:
+        if os.fstat(sdf_file.fileno()).st_size < _MMAP_MIN_FILE_SIZE:
+            # Small files are cheaper to read in one go than to map.
+            return _decode_sdf_buffer(memoryview(sdf_file.read()))
+        # Map large files so that pages are only read in as they're needed.
+        # The mapping isn't closed explicitly, since a traceback may still
+        # hold views of it; it's unmapped once nothing references it. None of
+        # the decoded values reference it.
+        sdf_mmap = mmap.mmap(sdf_file.fileno(), 0, access=mmap.ACCESS_READ)
+        # The records are laid out in the order they're decoded, so ask for
+        # aggressive readahead where the platform supports it.
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            sdf_mmap.madvise(mmap.MADV_SEQUENTIAL)
+    return _decode_sdf_buffer(memoryview(sdf_mmap))
+
+
+def read_sdf_files(
+        sdf_filenames: Iterable[str],
+        workers: int | None = None) -> list[tuple[Any, Any]]:
+    """Read several binary SDF files in parallel.
+
+    Each file is decoded by read_sdf_file in a separate process. Decoding is
+    CPU bound Python code, so processes rather than threads are used to get
+    around the GIL.
+
+    Args:
+        sdf_filenames: An iterable of the SDF filenames to be read.
+        workers: The maximum number of worker processes. Defaults to the
+            number of processors on the machine.
+
+    Returns:
+        A list of the (header, data) tuples returned by read_sdf_file, in the
+            same order as sdf_filenames.
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read_sdf_file, sdf_filenames))
+
+
+def _iter_sdf_records(
+        sdf_buffer: memoryview,
+        record_offset: int,
+        num_records: int,
+        record_type: int,
+        record_name: str) -> Iterator[tuple[int, memoryview]]:
+    """Walk consecutive records of one type, yielding each size and record.
+
+    Raises:
+        SDFFormatError: If a record isn't of the expected type.
+    """
+    for _ in range(num_records):
+        (actual_record_type, record_size) = \
+            _RECORD_HDR_STRUCT.unpack_from(sdf_buffer, record_offset)
+        if actual_record_type != record_type:
+            raise SDFFormatError(
+                f'This should have been a {record_name} record.')
+        next_record_offset = record_offset + record_size
+        yield record_size, sdf_buffer[record_offset:next_record_offset]
+        record_offset = next_record_offset
+
+
+def _decode_sdf_buffer(sdf_buffer: memoryview) -> tuple[Any, Any]:
+    """Decode the contents of an SDF file held in a buffer.
+
+    Args:
+        sdf_buffer: A memoryview of the entire SDF file.
+
     Returns:
         A tuple containing a dictionary of the header information and a numpy
             array containing the data.
@@ -735,268 +1030,196 @@ def read_sdf_file(sdf_filename: str) -> tuple[Any, Any]:
     # There are zero or more channel header records.
     sdf_hdr['channel_hdr'] = []
 
-    with open(sdf_filename, 'rb') as sdf_file:
-        # Read SDF file_identfication
-        file_identifier = sdf_file.read(2)
-        if file_identifier != b'B\x00':
-            # Didn't find a valid file identifer, so bail out
-            sys.exit(f'Invalid file identifier: {file_identifier!r}')
-        sdf_hdr['valid_file_identifier'] = True
-
-        # Determine record type (short) and record size (long)
-        # Every record has these two special fields at the start
-        # > = big-endian
-        # h = short integer (2 bytes)
-        # l = long integer (4 bytes)
-        record_type_size_format = '>hl'
-
-        # Process the file header record
-        file_hdr_record_type, file_hdr_record_size = struct.unpack(
-            record_type_size_format,
-            sdf_file.read(struct.calcsize(
-                record_type_size_format.encode())))
-        # Confirm this is a file header record.
-        if file_hdr_record_type != FILE_HDR_RECORD_TYPE:
-            sys.exit('Error processing SDF file; expected file header')
-        # Found the file header record
-        # Process the entire file header record including the record type
-        # (short) and record size (long)
-        sdf_file.seek(sdf_file.tell() -
-                      struct.calcsize(record_type_size_format))
-        sdf_hdr['file_hdr'] = _decode_sdf_file_hdr(
-            file_hdr_record_size,
-            sdf_file.read(file_hdr_record_size))
-
-        # Process the measurement header record
-        meas_hdr_record_type, meas_hdr_record_size = struct.unpack(
-            record_type_size_format,
-            sdf_file.read(struct.calcsize(record_type_size_format)))
-        # Confirm this is a measurement header record.
-        if meas_hdr_record_type != MEAS_HDR_RECORD_TYPE:
-            sys.exit('Error processing SDF file; expected measurement header')
-        # Found the measurement header record
-        sdf_file.seek(sdf_file.tell() -
-                      struct.calcsize(record_type_size_format))
-        sdf_hdr['meas_hdr'] = _decode_sdf_meas_hdr(
-            meas_hdr_record_size,
+    # Read SDF file_identfication
+    if sdf_buffer[0:2] != b'B\x00':
+        # Didn't find a valid file identifer, so bail out
+        raise SDFFormatError(
+            f'Invalid file identifier: {bytes(sdf_buffer[0:2])!r}')
+    sdf_hdr['valid_file_identifier'] = True
+
+    # Process the file header record, which immediately follows the file
+    # identifier.
+    record_offset = 2
+    (file_hdr_record_type, file_hdr_record_size) = \
+        _RECORD_HDR_STRUCT.unpack_from(sdf_buffer, record_offset)
+    # Confirm this is a file header record.
+    if file_hdr_record_type != FILE_HDR_RECORD_TYPE:
+        raise SDFFormatError('Error processing SDF file; expected file header')
+    # Found the file header record
+    # Process the entire file header record including the record type
+    # (short) and record size (long)
+    sdf_hdr['file_hdr'] = _decode_sdf_file_hdr(
+        file_hdr_record_size,
+        sdf_buffer[record_offset:record_offset + file_hdr_record_size])
+    record_offset += file_hdr_record_size
+
+    # Process the measurement header record, which immediately follows the
+    # file header record.
+    (meas_hdr_record_type, meas_hdr_record_size) = \
+        _RECORD_HDR_STRUCT.unpack_from(sdf_buffer, record_offset)
+    # Confirm this is a measurement header record.
+    if meas_hdr_record_type != MEAS_HDR_RECORD_TYPE:
+        raise SDFFormatError(
+            'Error processing SDF file; expected measurement header')
+    # Found the measurement header record
+    sdf_hdr['meas_hdr'] = _decode_sdf_meas_hdr(
+        meas_hdr_record_size,
+        sdf_hdr['file_hdr']['sdf_revision'],
+        sdf_buffer[record_offset:record_offset + meas_hdr_record_size])
+
+    # Decode the data header records
+    decode_data_hdr = _DATA_HDR_DECODERS[sdf_hdr['file_hdr']['sdf_revision']]
+    sdf_hdr['data_hdr'] = [
+        decode_data_hdr(record_size, binary_data)
+        for record_size, binary_data in _iter_sdf_records(
+            sdf_buffer,
+            sdf_hdr['file_hdr']['offset_data_hdr_record'],
+            sdf_hdr['file_hdr']['num_data_hdr_records'],
+            DATA_HDR_RECORD_TYPE, 'data header')]
+
+    # Decode the vector header records
+    sdf_hdr['vector_hdr'] = []
+    record_offset = sdf_hdr['file_hdr']['offset_vector_record']
+    num_vector_hdr_records = sdf_hdr['file_hdr']['num_vector_hdr_records']
+    if num_vector_hdr_records > 0:
+        # Read the record size of the first record
+        # The record type should be 13 and the size should be 18 bytes
+        _, vector_hdr_record_size = _RECORD_HDR_STRUCT.unpack_from(
+            sdf_buffer, record_offset)
+        # The vector header records are all the same size and stored one
+        # after another, so decode them all at once.
+        sdf_hdr['vector_hdr'] = _decode_sdf_vector_hdrs(
+            vector_hdr_record_size,
+            sdf_hdr['file_hdr']['sdf_revision'],
+            num_vector_hdr_records,
+            sdf_buffer[record_offset:record_offset +
+                       num_vector_hdr_records * vector_hdr_record_size])
+
+    # Decode the channel header records
+    sdf_hdr['channel_hdr'] = []
+    record_offset = sdf_hdr['file_hdr']['offset_channel_record']
+    num_channel_hdr_records = sdf_hdr['file_hdr']['num_channel_hdr_records']
+    if num_channel_hdr_records > 0:
+        # Read the record size of the first record
+        _, channel_hdr_record_size = _RECORD_HDR_STRUCT.unpack_from(
+            sdf_buffer, record_offset)
+        # The channel header records are all the same size and stored one
+        # after another, so decode them all at once.
+        sdf_hdr['channel_hdr'] = _decode_sdf_channel_hdrs(
+            channel_hdr_record_size,
             sdf_hdr['file_hdr']['sdf_revision'],
-            sdf_file.read(meas_hdr_record_size))
-
-        # Decode the data header records
-        sdf_hdr['data_hdr'] = []
-        # Initialize record size to 0 until we know the answer
-        data_hdr_record_size = 0
-        for data_hdr_record_index in range(
-                sdf_hdr['file_hdr']['num_data_hdr_records']):
-            # Move to the start of the data header record
-            sdf_file.seek(sdf_hdr['file_hdr']['offset_data_hdr_record'] +
-                          data_hdr_record_index * data_hdr_record_size)
-            # Read the record type and size
-            data_hdr_record_type, data_hdr_record_size = struct.unpack(
-                record_type_size_format,
-                sdf_file.read(struct.calcsize(record_type_size_format)))
-            # Confirm this is a data header record.
-            if data_hdr_record_type != DATA_HDR_RECORD_TYPE:
-                sys.exit('This should have been a data header record.')
-            # This is a data header record
-            sdf_file.seek(sdf_file.tell() -
-                          struct.calcsize(record_type_size_format))
-            sdf_hdr['data_hdr'].append(
-                _decode_sdf_data_hdr(
-                    data_hdr_record_size,
-                    sdf_hdr['file_hdr']['sdf_revision'],
-                    sdf_file.read(data_hdr_record_size)))
-
-        # Decode the vector header records
-        sdf_hdr['vector_hdr'] = []
-        # Initialize record size to 0 until we know the answer
-        vector_hdr_record_size = 0
-        for vector_hdr_record_index in range(
-                sdf_hdr['file_hdr']['num_vector_hdr_records']):
-            # Move to the start of the vector header record
-            sdf_file.seek(sdf_hdr['file_hdr']['offset_vector_record'] +
-                          vector_hdr_record_index * vector_hdr_record_size)
-            # Read the record type and size
-            # The record type should be 13 and the size should be 18 bytes
-            vector_hdr_record_type, vector_hdr_record_size = struct.unpack(
-                record_type_size_format,
-                sdf_file.read(struct.calcsize(record_type_size_format)))
-            # Confirm this is a vector header record.
-            if vector_hdr_record_type != VECTOR_HDR_RECORD_TYPE:
-                sys.exit('This should have been a vector header record.')
-            # This is a vector header record
-            # Backup and read all of the vector header record including
-            # the record type and record size
-            sdf_file.seek(sdf_file.tell() -
-                          struct.calcsize(record_type_size_format))
-            sdf_hdr['vector_hdr'].append(_decode_sdf_vector_hdr(
-                vector_hdr_record_size,
-                sdf_hdr['file_hdr']['sdf_revision'],
-                sdf_file.read(vector_hdr_record_size)))
-
-        # Decode the channel header records
-        sdf_hdr['channel_hdr'] = []
-        # Initialize record size to 0 until we know the answer
-        channel_hdr_record_size = 0
-        for channel_hdr_record_index in range(
-                sdf_hdr['file_hdr']['num_channel_hdr_records']):
-            # Move to the start of the channel header record
-            sdf_file.seek(sdf_hdr['file_hdr']['offset_channel_record'] +
-                          channel_hdr_record_index * channel_hdr_record_size)
-            # Read the record type and size
-            channel_hdr_record_type, channel_hdr_record_size = struct.unpack(
-                record_type_size_format,
-                sdf_file.read(struct.calcsize(record_type_size_format)))
-            # Confirm this is a channel header record.
-            if channel_hdr_record_type != CHANNEL_HDR_RECORD_TYPE:
-                sys.exit('This should have been a channel header record.')
-            # This is a channel header record
-            # Backup and read all of the channel header record including
-            # the record type and record size
-            sdf_file.seek(sdf_file.tell() -
-                          struct.calcsize(record_type_size_format))
-            sdf_hdr['channel_hdr'].append(_decode_sdf_channel_hdr(
-                channel_hdr_record_size,
-                sdf_hdr['file_hdr']['sdf_revision'],
-                sdf_file.read(channel_hdr_record_size)))
-
-        # Decode the scan structure records
-        # Initialize record size to 0 until we know the answer
-        scan_struct_record_size = 0
-        for scan_struct_record_index in range(
-                sdf_hdr['file_hdr']['num_scan_struct_records']):
-            # Move to the start of the scan struct record
-            sdf_file.seek(sdf_hdr['file_hdr']['offset_scan_struct_record'] +
-                          scan_struct_record_index * scan_struct_record_size)
-            # Read the record type and size
-            scan_struct_record_type, scan_struct_record_size = struct.unpack(
-                record_type_size_format,
-                sdf_file.read(struct.calcsize(record_type_size_format)))
-            # Confirm this is a channel header record.
-            if scan_struct_record_type != SCAN_STRUCT_RECORD_TYPE:
-                sys.exit('This should have been a scan struct record.')
-            # This is a channel header record
-            # Backup and read all of the channel header record including
-            # the record type and record size
-            sdf_file.seek(sdf_file.tell() -
-                          struct.calcsize(record_type_size_format))
-            sdf_hdr['scan_struct'] = _decode_sdf_scan_struct(
-                scan_struct_record_size,
-                sdf_hdr['file_hdr']['sdf_revision'],
-                sdf_file.read(scan_struct_record_size))
-
-        # ------------------------------------------------------------------- #
-        # Decode the Y-axis data records
-        # The y-data offset will be -1 if there is no y-data
-        # ------------------------------------------------------------------- #
-        if sdf_hdr['file_hdr']['offset_ydata_record'] >= 0:
-            # Move to the start of the y-axis data record
-            sdf_file.seek(sdf_hdr['file_hdr']['offset_ydata_record'])
-            # Read the record type and size
-            yaxis_data_record_type, yaxis_data_record_size = struct.unpack(
-                record_type_size_format,
-                sdf_file.read(struct.calcsize(record_type_size_format)))
-            # Confirm we received a y-axis data record
-            if yaxis_data_record_type != YDATA_HDR_RECORD_TYPE:
-                sys.exit('This should have been a scan struct record.')
-
-            # FIXME: Need to handle more than just the first data_hdr
-            data_hdr = sdf_hdr['data_hdr'][0]
-            vector_id = data_hdr['first_vector_record_num']
-
-            # Create the combined trace correction factor.
-            vector_hdr = sdf_hdr['vector_hdr'][vector_id]
-            resp_ch_id = vector_hdr['channel_record'][0]
-            pwr_of_resp_ch = vector_hdr['channel_power_48x'][0]
-            exciter_ch_id = vector_hdr['channel_record'][1]
-            pwr_of_exciter_ch = vector_hdr['channel_power_48x'][1]
-
-            # Calculate the response channel combined correction factor.
-            if resp_ch_id == -1:
-                resp_ch_corr_factor = 1
+            sdf_buffer[record_offset:record_offset +
+                       num_channel_hdr_records * channel_hdr_record_size])
+
+    # Decode the scan structure records
+    for record_size, binary_data in _iter_sdf_records(
+            sdf_buffer,
+            sdf_hdr['file_hdr']['offset_scan_struct_record'],
+            sdf_hdr['file_hdr']['num_scan_struct_records'],
+            SCAN_STRUCT_RECORD_TYPE, 'scan struct'):
+        sdf_hdr['scan_struct'] = _decode_sdf_scan_struct(
+            record_size, sdf_hdr['file_hdr']['sdf_revision'], binary_data)
+
+    # ------------------------------------------------------------------- #
+    # Decode the Y-axis data records
+    # The y-data offset will be -1 if there is no y-data
+    # ------------------------------------------------------------------- #
+    if sdf_hdr['file_hdr']['offset_ydata_record'] >= 0:
+        # Move to the start of the y-axis data record
+        record_offset = sdf_hdr['file_hdr']['offset_ydata_record']
+        # Read the record type and size
+        (yaxis_data_record_type, yaxis_data_record_size) = \
+            _RECORD_HDR_STRUCT.unpack_from(sdf_buffer, record_offset)
+        # Confirm we received a y-axis data record
+        if yaxis_data_record_type != YDATA_HDR_RECORD_TYPE:
+            raise SDFFormatError('This should have been a y-axis data record.')
+        # FIXME: Need to handle more than just the first data_hdr
+        data_hdr = sdf_hdr['data_hdr'][0]
+        vector_id = data_hdr['first_vector_record_num']
+
+        # Create the combined trace correction factor.
+        vector_hdr = sdf_hdr['vector_hdr'][vector_id]
+        resp_ch_id = vector_hdr['channel_record'][0]
+        pwr_of_resp_ch = vector_hdr['channel_power_48x'][0]
+        exciter_ch_id = vector_hdr['channel_record'][1]
+        pwr_of_exciter_ch = vector_hdr['channel_power_48x'][1]
+        channel_hdrs = sdf_hdr['channel_hdr']
+        # The window correction is necessary only for FREQ or ORDER domain
+        # data.
+        needs_window_corr = data_hdr['domain'] in _WINDOW_CORRECTED_DOMAINS
+
+        # Calculate the response channel combined correction factor.
+        if resp_ch_id == -1:
+            resp_ch_corr_factor = 1.0
+        else:
+            resp_ch = channel_hdrs[resp_ch_id]
+            # Calculate the engineering unit (EU) correction. EU correction
+            # allows you to convert y-axis data from the instrument’s
+            # internal unit to some user-defined unit (such as g — the
+            # acceleration of gravity). An EU correction factor is included
+            # in each Channel Header record; the factor’s field name is
+            # int2engrUnit.
+            resp_eu_corr = resp_ch['int_2_eng_unit']
+
+            # Calculate the window correction.
+            if needs_window_corr:
+                resp_window_corr = \
+                    resp_ch['window']['narrow_band_corr']
             else:
-                resp_ch = sdf_hdr['channel_hdr'][resp_ch_id]
-                # Calculate the engineering unit (EU) correction. EU correction
-                # allows you to convert y-axis data from the instrument’s
-                # internal unit to some user-defined unit (such as g — the
-                # acceleration of gravity). An EU correction factor is included
-                # in each Channel Header record; the factor’s field name is
-                # int2engrUnit.
-                resp_eu_corr = resp_ch['int_2_eng_unit']
-
-                # Calculate the window correction, which is necessary only for
-                # FREQ or ORDER domain data.
-                if data_hdr['domain'] == 'Frequency domain' or \
-                        data_hdr['domain'] == 'Channel':
-                    resp_window_corr = \
-                        resp_ch['window']['narrow_band_corr']
-                else:
-                    resp_window_corr = 1.0
-
-                # Calculate te combined correction factor for the response
-                # channel.
-                resp_ch_corr_factor = (
-                    (resp_window_corr / resp_eu_corr) ** (pwr_of_resp_ch / 48))
-
-            # Calculate the exciter channel combined correction factor.
-            if exciter_ch_id == -1:
-                exciter_ch_corr_factor = 1
+                resp_window_corr = 1.0
+
+            # Calculate te combined correction factor for the response
+            # channel.
+            resp_ch_corr_factor = _channel_corr_factor(
+                resp_window_corr, resp_eu_corr, pwr_of_resp_ch)
+
+        # Calculate the exciter channel combined correction factor.
+        if exciter_ch_id == -1:
+            exciter_ch_corr_factor = 1.0
+        else:
+            exciter_ch = channel_hdrs[exciter_ch_id]
+            exciter_eu_corr = exciter_ch['int_2_eng_unit']
+
+            # Calculate the window correction.
+            if needs_window_corr:
+                exciter_window_corr = \
+                    exciter_ch['window']['narrow_band_corr']
             else:
-                exciter_ch = sdf_hdr['channel_hdr'][exciter_ch_id]
-                exciter_eu_corr = exciter_ch['int_2_eng_unit']
-
-                # Calculate the window correction, which is necessary only for
-                # FREQ or ORDER domain data.
-                if data_hdr['domain'] == 'Frequency domain' or \
-                        data_hdr['domain'] == 'Channel':
-                    exciter_window_corr = \
-                        exciter_ch['window']['narrow_band_corr']
-                else:
-                    exciter_window_corr = 1.0
-
-                # Calculate te combined correction factor for the exciter
-                # channel.
-                exciter_ch_corr_factor = (
-                    (exciter_window_corr / exciter_eu_corr) **
-                    (pwr_of_exciter_ch / 48))
-
-            trace_corr_factor = resp_ch_corr_factor * exciter_ch_corr_factor
-
-            # Read the y-axis data record
-            # FIXME: Need to handle cases where the y-data has muliple points.
-            # Right now we're only handling either single floats or single
-            # complex values.
-            dtype: Any = np.dtype('>f')
-            count = data_hdr['num_points']
-            if data_hdr['y_is_complex']:
-                dtype = np.dtype('>c8')
-                count *= 2
-            sdf_data = np.fromfile(
-                file=sdf_file,
-                dtype=dtype,
-                count=count,
-                sep='')
-
-            # Apply the trace correction factor.
-            sdf_data = trace_corr_factor * sdf_data
-
-            # FIXME: I'm cheating if this is a 35670A measurement and
-            # converting from the Vpk^2 (native units) to Vrms. Convert from
-            # Vpk^2 to Vpk and then to Vrms
-            if sdf_hdr['file_hdr']['application'] == 'HP 35670A':
-                sdf_data = np.sqrt(sdf_data) / np.sqrt(2)
-
-            # FIXME: I'm only returning the data over the start and stop
-            # frequency indices, which are 0 & 1600, respectively. The
-            # last_valid_index is 2048. Why the discrepancy?
-            start_idx = sdf_hdr['meas_hdr']['start_freq_index']
-            stop_idx = sdf_hdr['meas_hdr']['stop_freq_index']
-            sdf_data = sdf_data[start_idx:stop_idx+1]
+                exciter_window_corr = 1.0
+
+            # Calculate te combined correction factor for the exciter
+            # channel.
+            exciter_ch_corr_factor = _channel_corr_factor(
+                exciter_window_corr, exciter_eu_corr, pwr_of_exciter_ch)
+
+        trace_corr_factor = resp_ch_corr_factor * exciter_ch_corr_factor
+
+        # Read the y-axis data record
+        # FIXME: I'm only returning the data over the start and stop
+        # frequency indices, which are 0 & 1600, respectively. The
+        # last_valid_index is 2048. Why the discrepancy?
+        sdf_data = _decode_sdf_ydata(
+            data_hdr, sdf_buffer, record_offset + _RECORD_HDR_STRUCT.size,
+            sdf_hdr['meas_hdr']['start_freq_index'],
+            sdf_hdr['meas_hdr']['stop_freq_index'])
+
+        # Apply the trace correction factor. This also copies the data out of
+        # the file buffer into a native byte order array that can be updated
+        # in place.
+        sdf_data = trace_corr_factor * sdf_data
+
+        # FIXME: I'm cheating if this is a 35670A measurement and
+        # converting from the Vpk^2 (native units) to Vrms. Convert from
+        # Vpk^2 to Vpk and then to Vrms
+        if sdf_hdr['file_hdr']['application'] == 'HP 35670A':
+            np.sqrt(sdf_data, out=sdf_data)
+            sdf_data = sdf_data / np.sqrt(2)
 
     return sdf_hdr, sdf_data
 
 
-if __name__ == "__main__":
+def main(argv: list[str] | None = None) -> None:
+    """Convert an SDF file header to JSON from the command line."""
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('filetype', action='store',
@@ -1005,9 +1228,35 @@ if __name__ == "__main__":
                         help='Input filename excluding extension')
     parser.add_argument('outputfile', action='store',
                         help='Output json filename')
-    args = parser.parse_args()
+    parser.add_argument('--orjson', action='store_true',
+                        help='Write the json with the faster orjson package, '
+                        'which writes NaN and infinity as null, writes small '
+                        'floats such as 1e-05 without an exponent and leaves '
+                        'non-ASCII characters unescaped')
+    args = parser.parse_args(argv)
 
     if args.filetype == 'sdf':
-        sdf_hdr, sdf_data = read_sdf_file(args.inputfile)
-        with open(args.outputfile, "w") as outfile:
-            json.dump(sdf_hdr, outfile, indent=2, default=str)
+        try:
+            sdf_hdr, sdf_data = read_sdf_file(args.inputfile)
+        except SDFFormatError as err:
+            sys.exit(str(err))
+        if args.orjson:
+            # orjson is an optional, much faster JSON encoder.
+            try:
+                import orjson
+            except ImportError:
+                parser.error('--orjson requires the orjson package')
+            # Pass datetimes through to str, as json.dump does, rather than
+            # using orjson's RFC 3339 format.
+            with open(args.outputfile, "wb") as binary_outfile:
+                binary_outfile.write(orjson.dumps(
+                    sdf_hdr, default=str,
+                    option=orjson.OPT_INDENT_2 |
+                    orjson.OPT_PASSTHROUGH_DATETIME))
+        else:
+            with open(args.outputfile, "w") as outfile:
+                json.dump(sdf_hdr, outfile, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -51,7 +51,9 @@ setuptools.setup(
     description='Read HP SDF binary and ASCII files',
     long_description=long_description,
     long_description_content_type="text/markdown",
-    requires=['numpy (>=1.22.0)'],
+    python_requires='>=3.8',
+    install_requires=['numpy>=1.23.0'],
+    extras_require={'orjson': ['orjson']},
     classifiers=[
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
@@ -1,14 +1,12 @@
 # -*- coding: utf-8 -*-
 
-# Try to future proof code so that it's Python 3.x ready
-from __future__ import print_function
-from __future__ import unicode_literals
-from __future__ import division
-from __future__ import absolute_import
-
 import datetime
+import json
 import os
+import sys
+import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
 
@@ -17,7 +15,8 @@ import sdfascii
 
 class TestReadingSDFFormat(unittest.TestCase):
 
-    def setUp(self):  # noqa
+    @classmethod
+    def setUpClass(cls):  # noqa
         source_10mvrms_3khz_directory = os.path.join(
             os.path.dirname(os.path.realpath(__file__)),
             'source_10mVrms_3kHz')
@@ -28,12 +27,9 @@ class TestReadingSDFFormat(unittest.TestCase):
         ascii_ydata_file = os.path.join(source_10mvrms_3khz_directory,
                                         'ASCII3KH.TXT')
 
-        self.sdf_hdr, self.sdf_data = sdfascii.read_sdf_file(sdf_file)
-
-        self.ascii_ydata = np.loadtxt(ascii_ydata_file)
+        cls.sdf_hdr, cls.sdf_data = sdfascii.read_sdf_file(sdf_file)
 
-    def tearDown(self):  # noqa
-        pass
+        cls.ascii_ydata = np.loadtxt(ascii_ydata_file)
 
     def test_reading_sdf_file_identifier(self):
         self.assertTrue(self.sdf_hdr['valid_file_identifier'],
@@ -475,7 +471,7 @@ class TestReadingSDFFormat(unittest.TestCase):
             self.sdf_hdr['scan_struct']['scan_unit']['plane_angle'], 0)
 
     def test_ydata_max_value(self):
-        max_value = self.sdf_data[self.sdf_data.argmax()]
+        max_value = self.sdf_data.max()
         self.assertAlmostEqual(max_value, 0.01009883)
 
     def test_ydata(self):
@@ -484,7 +480,8 @@ class TestReadingSDFFormat(unittest.TestCase):
 
 class TestReadingASCIIFormat(unittest.TestCase):
 
-    def setUp(self):  # noqa
+    @classmethod
+    def setUpClass(cls):  # noqa
         source_10mvrms_3khz_directory = os.path.join(
             os.path.dirname(os.path.realpath(__file__)),
             'source_10mVrms_3kHz')
@@ -492,10 +489,7 @@ class TestReadingASCIIFormat(unittest.TestCase):
         ascii_file_basename = os.path.join(source_10mvrms_3khz_directory,
                                            'ASCII3KH')
 
-        self.ascii_data = sdfascii.read_ascii_files(ascii_file_basename)
-
-    def tearDown(self):  # noqa
-        pass
+        cls.ascii_data = sdfascii.read_ascii_files(ascii_file_basename)
 
     def test_starting_frequency(self):
         self.assertEqual(self.ascii_data['frequency'][0], 0)
@@ -509,6 +503,206 @@ class TestReadingASCIIFormat(unittest.TestCase):
                                       frequency_answer)
 
     def test_ydata_max_value(self):
-        max_value = self.ascii_data.amplitude[
-            self.ascii_data.amplitude.argmax()]
+        max_value = self.ascii_data.amplitude.max()
         self.assertAlmostEqual(max_value, 0.01009883)
+
+
+class TestReadingMemoryMappedSDFFormat(unittest.TestCase):
+
+    def setUp(self):  # noqa
+        self.sdf_file = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'source_10mVrms_3kHz', 'SDF3KHZ.DAT')
+
+    def test_memory_mapped_file_matches_read_file(self):
+        sdf_hdr, sdf_data = sdfascii.read_sdf_file(self.sdf_file)
+        with mock.patch.object(sdfascii, '_MMAP_MIN_FILE_SIZE', 0):
+            mmap_sdf_hdr, mmap_sdf_data = sdfascii.read_sdf_file(
+                self.sdf_file)
+        self.assertEqual(mmap_sdf_hdr, sdf_hdr)
+        np.testing.assert_array_equal(mmap_sdf_data, sdf_data)
+
+
+class TestSDFFormatError(unittest.TestCase):
+
+    def test_invalid_file_identifier_raises_sdf_format_error(self):
+        with self.assertRaises(sdfascii.SDFFormatError):
+            sdfascii._decode_sdf_buffer(memoryview(b'XY' + bytes(80)))
+
+    def test_main_exits_with_the_sdf_format_error_message(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sdf_file = os.path.join(tmp_dir, 'INVALID.DAT')
+            with open(sdf_file, 'wb') as f:
+                f.write(b'XY' + bytes(80))
+            with self.assertRaises(SystemExit) as cm:
+                sdfascii.main(
+                    ['sdf', sdf_file, os.path.join(tmp_dir, 'INVALID.json')])
+        with self.assertRaises(sdfascii.SDFFormatError) as expected:
+            sdfascii._decode_sdf_buffer(memoryview(b'XY' + bytes(80)))
+        self.assertEqual(cm.exception.code, str(expected.exception))
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):  # noqa
+        self.sdf_hdr = {'delay': 1e-05, 'gate_begin': float('nan'),
+                        'title': '\u00e9'}
+
+    def test_main_writes_json_dump_output_by_default(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_file = os.path.join(tmp_dir, 'TRACE.json')
+            with mock.patch.object(sdfascii, 'read_sdf_file',
+                                   return_value=(self.sdf_hdr, None)):
+                sdfascii.main(['sdf', 'TRACE.DAT', json_file])
+            with open(json_file) as f:
+                self.assertEqual(
+                    f.read(),
+                    json.dumps(self.sdf_hdr, indent=2, default=str))
+
+    def test_main_orjson_without_orjson_installed_exits(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_file = os.path.join(tmp_dir, 'TRACE.json')
+            with mock.patch.object(sdfascii, 'read_sdf_file',
+                                   return_value=(self.sdf_hdr, None)), \
+                    mock.patch.dict(sys.modules, {'orjson': None}), \
+                    mock.patch('sys.stderr'), \
+                    self.assertRaises(SystemExit):
+                sdfascii.main(['sdf', 'TRACE.DAT', json_file, '--orjson'])
+            self.assertFalse(os.path.exists(json_file))
+
+
+class TestDecodingSDFFileHdr(unittest.TestCase):
+
+    def test_invalid_measurement_start_datetime_decodes_as_none(self):
+        # Revision 2 file header dated month 0, day 0 of 2013.
+        binary_data = memoryview(bytes(6) + sdfascii._FILE_HDR_STRUCT.pack(
+            2, -14, 2013, 0, 908, b'A.00.00', *([0] * 13)))
+        file_hdr = sdfascii._decode_sdf_file_hdr(len(binary_data), binary_data)
+        self.assertIsNone(file_hdr['measurement_start_datetime'])
+
+
+class TestDecodingSDFDataHdr(unittest.TestCase):
+
+    def test_revision_3_data_hdr_decodes_revision_2_fields(self):
+        sdf_file = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'source_10mVrms_3kHz', 'SDF3KHZ.DAT')
+        sdf_hdr, _ = sdfascii.read_sdf_file(sdf_file)
+        file_hdr = sdf_hdr['file_hdr']
+        data_hdr = sdf_hdr['data_hdr'][0]
+        with open(sdf_file, 'rb') as f:
+            f.seek(file_hdr['offset_data_hdr_record'])
+            binary_data = memoryview(f.read(data_hdr['record_size']))
+        self.assertEqual(
+            sdfascii._DATA_HDR_DECODERS[3](
+                data_hdr['record_size'], binary_data),
+            data_hdr)
+
+
+class TestDecodingUnknownCodes(unittest.TestCase):
+
+    def test_unknown_window_codes_decode_as_unknown(self):
+        window = sdfascii._decode_sdf_window(memoryview(
+            sdfascii._WINDOW_STRUCT.pack(99, 99, 1, 2, 3, 4, 5)))
+        self.assertEqual(window['window_type'], 'Unknown')
+        self.assertEqual(window['correction_mode'], 'Unknown')
+
+    def test_negative_window_codes_decode_as_unknown(self):
+        window = sdfascii._decode_sdf_window(memoryview(
+            sdfascii._WINDOW_STRUCT.pack(-1, -1, 1, 2, 3, 4, 5)))
+        self.assertEqual(window['window_type'], 'Unknown')
+        self.assertEqual(window['correction_mode'], 'Unknown')
+
+
+class TestDecodingSDFYData(unittest.TestCase):
+
+    def test_complex_short_ydata_with_two_values_per_point(self):
+        data_hdr = {'y_data_type': 'short', 'y_per_point': 2,
+                    'y_is_complex': True, 'num_points': 2}
+        binary_data = memoryview(
+            np.array([1, 2, 3, 4, 5, 6, 7, 8], dtype='>i2').tobytes())
+        y_data = sdfascii._decode_sdf_ydata(data_hdr, binary_data, 0)
+        np.testing.assert_array_equal(
+            y_data, [[1 + 2j, 3 + 4j], [5 + 6j, 7 + 8j]])
+
+    def test_zero_y_per_point_raises_sdf_format_error(self):
+        data_hdr = {'y_data_type': 'short', 'y_per_point': 0,
+                    'y_is_complex': False, 'num_points': 8}
+        binary_data = memoryview(
+            np.array([1, 2, 3, 4, 5, 6, 7, 8], dtype='>i2').tobytes())
+        with self.assertRaises(sdfascii.SDFFormatError):
+            sdfascii._decode_sdf_ydata(data_hdr, binary_data, 0)
+
+    def test_negative_y_per_point_raises_sdf_format_error(self):
+        data_hdr = {'y_data_type': 'short', 'y_per_point': -1,
+                    'y_is_complex': False, 'num_points': 8}
+        binary_data = memoryview(
+            np.array([1, 2, 3, 4, 5, 6, 7, 8], dtype='>i2').tobytes())
+        with self.assertRaises(sdfascii.SDFFormatError):
+            sdfascii._decode_sdf_ydata(data_hdr, binary_data, 0)
+
+    def test_truncated_ydata_decodes_the_points_present(self):
+        data_hdr = {'y_data_type': 'short', 'y_per_point': 1,
+                    'y_is_complex': False, 'num_points': 20}
+        binary_data = memoryview(
+            np.array([1, 2, 3, 4, 5, 6, 7, 8], dtype='>i2').tobytes())
+        y_data = sdfascii._decode_sdf_ydata(data_hdr, binary_data, 0)
+        np.testing.assert_array_equal(y_data, [1, 2, 3, 4, 5, 6, 7, 8])
+
+    def test_start_idx_past_the_end_decodes_no_points(self):
+        data_hdr = {'y_data_type': 'short', 'y_per_point': 1,
+                    'y_is_complex': False, 'num_points': 20}
+        binary_data = memoryview(
+            np.array([1, 2, 3, 4, 5, 6, 7, 8], dtype='>i2').tobytes())
+        y_data = sdfascii._decode_sdf_ydata(
+            data_hdr, binary_data, 0, start_idx=10)
+        self.assertEqual(y_data.shape, (0,))
+
+    def test_offset_past_the_end_decodes_no_points(self):
+        data_hdr = {'y_data_type': 'short', 'y_per_point': 1,
+                    'y_is_complex': False, 'num_points': 20}
+        binary_data = memoryview(
+            np.array([1, 2, 3, 4], dtype='>i2').tobytes())
+        y_data = sdfascii._decode_sdf_ydata(data_hdr, binary_data, 16)
+        self.assertEqual(y_data.shape, (0,))
+
+
+class TestReadingMultipleSDFFiles(unittest.TestCase):
+
+    def test_read_sdf_files_matches_read_sdf_file(self):
+        sdf_files = [
+            os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                         'source_10mVrms_3kHz', 'SDF3KHZ.DAT'),
+            os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                         os.pardir, 'examples', 'HP35670A.DAT')]
+        results = sdfascii.read_sdf_files(sdf_files, workers=2)
+        self.assertEqual(len(results), len(sdf_files))
+        for sdf_file, (sdf_hdr, sdf_data) in zip(sdf_files, results):
+            expected_hdr, expected_data = sdfascii.read_sdf_file(sdf_file)
+            self.assertEqual(sdf_hdr, expected_hdr)
+            np.testing.assert_array_equal(sdf_data, expected_data)
+
+
+class TestHeaderKeyOrder(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):  # noqa
+        examples_directory = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), os.pardir,
+            'examples')
+        cls.sdf_hdr, _ = sdfascii.read_sdf_file(
+            os.path.join(examples_directory, 'HP35670A.DAT'))
+        with open(os.path.join(examples_directory, 'hp35670a.json')) as f:
+            cls.example_hdr = json.load(f)
+
+    def test_file_hdr_key_order_matches_example_json(self):
+        self.assertEqual(list(self.sdf_hdr['file_hdr']),
+                         list(self.example_hdr['file_hdr']))
+
+    def test_meas_hdr_key_order_matches_example_json(self):
+        self.assertEqual(list(self.sdf_hdr['meas_hdr']),
+                         list(self.example_hdr['meas_hdr']))
+
+    def test_data_hdr_key_order_matches_example_json(self):
+        self.assertEqual(list(self.sdf_hdr['data_hdr'][0]),
+                         list(self.example_hdr['data_hdr'][0]))